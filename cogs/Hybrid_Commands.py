@@ -1,23 +1,18 @@
 import discord
 from discord.ext import commands
-import aiohttp
 import asyncio
+import orjson
 
 class ComickSlash(commands.Cog):
     BASE_URL = "https://comick-api-proxy.notaspider.dev/api"
     WEB_BASE = "https://comick.dev"
-    TIMEOUT = aiohttp.ClientTimeout(total=10)
 
     def __init__(self, bot):
         self.bot = bot
         self.session = None
 
     async def cog_load(self):
-        self.session = aiohttp.ClientSession(timeout=self.TIMEOUT)
-
-    async def cog_unload(self):
-        if self.session:
-            await self.session.close()
+        self.session = self.bot.http_session
 
     # ---------------- Utility ----------------
     async def fetch_json(self, url, params=None):
@@ -26,7 +21,7 @@ class ComickSlash(commands.Cog):
         try:
             async with self.session.get(url, params=params) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return await resp.json(loads=orjson.loads)
         except Exception:
             pass
         return None
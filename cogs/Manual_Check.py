@@ -1,66 +1,83 @@
 # cog/Manual_Check.py
 import discord
+import logging
 from discord import app_commands
 from discord.ext import commands
 import aiosqlite
-import aiohttp
-import traceback
+import asyncio
 
-class ManualCheck(commands.Cog):
+from cogs._db import configure_db
+from cogs._http import CachedFetchMixin
+
+log = logging.getLogger("manhwa.manual_check")
+
+SELECT_FOLLOWED_SQL = "SELECT manhwa_title, manhwa_slug, latest_chapter_notified FROM chapter_tracking WHERE user_id = ?"
+UPDATE_FOLLOWED_SQL = "UPDATE chapter_tracking SET latest_chapter_notified = ?, manhwa_slug = ?, last_notified_time = CURRENT_TIMESTAMP WHERE user_id = ? AND manhwa_title = ?"
+
+class ManualCheck(CachedFetchMixin, commands.Cog):
     PROXY_BASE = "https://comick-api-proxy.notaspider.dev/v1.0"
     WEB_BASE = "https://comick.dev"
+    MAX_CONCURRENCY = 10
+    FETCH_RETRIES = 0
 
     def __init__(self, bot):
         self.bot = bot
-        print("[ManualCheck] Cog initialized")
+        self.session = None
+        self._init_caches()
+        log.info("Cog initialized")
     async def cog_load(self):
-        self.session = aiohttp.ClientSession() 
-        print("[ManualCheck] Session created")
-        
-    async def cog_unload(self):
-        await self.session.close()
-        print("[ManualCheck] Session closed")
-
-    async def fetch_json(self, url: str, params=None):
-        try:
-            async with self.session.get(
-                url, 
-                headers={"User-Agent": "Tachiyomi/1.0"},
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status != 200:
-                    print(f"[ManualCheck] ❌ {response.status} for {url}")
-                    return None
-                return await response.json()
-        except Exception as e:
-            print(f"[ManualCheck] ⚠️ Fetch error for {url}: {e}")
-            return None
+        self.session = self.bot.http_session
+        log.info("Using shared session")
 
     async def resolve_slug(self, title: str, current_slug: str):
         """Try current slug first, then fallback to searching by title."""
+        # Known-bad slug/title pair, don't hit the proxy again
+        hit, _ = self._cache_get((current_slug, title))
+        if hit:
+            return None
+
+        # Slug served chapters recently
+        hit, _ = self._cache_get(current_slug)
+        if hit:
+            return current_slug
+
         # Try current slug
         url = f"{self.PROXY_BASE}/comic/{current_slug}/chapters"
-        data = await self.fetch_json(url, params={"limit": 1, "tachiyomi": "true"})
+        probe_status, data = await self.fetch_json_status(url, params={"limit": 1, "tachiyomi": "true"}, cache_key=current_slug)
         if data and "chapters" in data and len(data["chapters"]) > 0:
             return current_slug
 
         # Fallback: search by title
         search_url = f"{self.PROXY_BASE}/search"
-        data = await self.fetch_json(search_url, params={"q": title, "limit": 1})
+        search_status, data = await self.fetch_json_status(search_url, params={"q": title, "limit": 1})
         if data and "results" in data and len(data["results"]) > 0:
             new_slug = data["results"][0].get("slug")
-            print(f"[ManualCheck] Resolved slug for '{title}' -> {new_slug}")
+            log.info("Resolved slug for '%s' -> %s", title, new_slug)
             return new_slug
 
-        print(f"[ManualCheck] ❌ Could not resolve slug for '{title}'")
+        log.warning("❌ Could not resolve slug for '%s'", title)
+        # Only remember real misses; timeouts and 5xx are retried next time
+        if self._is_miss(probe_status) and self._is_miss(search_status):
+            self._cache_put((current_slug, title), None, self.NEGATIVE_TTL)
         return None
 
     async def get_latest_chapter(self, slug: str):
+        """Return the latest chapter for a slug, served from cache when fresh."""
+        hit, cached = self._cache_get(slug)
+        if hit:
+            return cached
+
+        latest = await self._fetch_latest_chapter(slug)
+        # Misses are negatively cached by resolve_slug under (slug, title)
+        if latest:
+            self._cache_put(slug, latest, self.POSITIVE_TTL)
+        return latest
+
+    async def _fetch_latest_chapter(self, slug: str):
         url = f"{self.PROXY_BASE}/comic/{slug}/chapters"
-        data = await self.fetch_json(url, params={"limit": 1, "tachiyomi": "true"})
+        data = await self.fetch_json(url, params={"limit": 1, "tachiyomi": "true"}, cache_key=slug)
         if not data or "chapters" not in data or len(data["chapters"]) == 0:
-            print(f"[ManualCheck] ❌ No chapter data for slug '{slug}'")
+            log.debug("❌ No chapter data for slug '%s'", slug)
             return None
 
         chapter = data["chapters"][0]
@@ -70,15 +87,34 @@ class ManualCheck(commands.Cog):
             "url": f"{self.WEB_BASE}/comic/{slug}/chapter/{chapter.get('hid')}"
         }
 
+    async def _check_one(self, row, sem):
+        """Resolve and fetch the latest chapter for one followed row."""
+        title, slug, _ = row
+        async with sem:
+            log.debug("Checking %s (%s)...", title, slug)
+
+            # Resolve slug first
+            resolved_slug = await self.resolve_slug(title, slug)
+            if not resolved_slug:
+                return None
+
+            latest = await self.get_latest_chapter(resolved_slug)
+            if not latest or not latest["number"]:
+                return None
+
+        return title, resolved_slug, latest
+
     @app_commands.command(name="manual_check", description="Manually check for updates for your followed novels.")
     async def manual_check(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         updates = []
+        pending_updates = []
 
         try:
             async with aiosqlite.connect("manhwa.db") as db:
+                await configure_db(db)
                 async with db.execute(
-                    "SELECT manhwa_title, manhwa_slug, latest_chapter_notified FROM chapter_tracking WHERE user_id = ?",
+                    SELECT_FOLLOWED_SQL,
                     (interaction.user.id,)
                 ) as cursor:
                     rows = await cursor.fetchall()
@@ -87,18 +123,20 @@ class ManualCheck(commands.Cog):
                     await interaction.followup.send("📭 You are not following any novels.", ephemeral=True)
                     return
 
-                for title, slug, last_notified in rows:
-                    print(f"[ManualCheck] Checking {title} ({slug})...")
+                sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
+                results = await asyncio.gather(
+                    *[self._check_one(row, sem) for row in rows],
+                    return_exceptions=True
+                )
 
-                    # Resolve slug first
-                    resolved_slug = await self.resolve_slug(title, slug)
-                    if not resolved_slug:
+                for (_, _, last_notified), result in zip(rows, results):
+                    if isinstance(result, Exception):
+                        log.warning("⚠️ Check failed: %s", result)
                         continue
-
-                    latest = await self.get_latest_chapter(resolved_slug)
-                    if not latest or not latest["number"]:
+                    if result is None:
                         continue
 
+                    title, resolved_slug, latest = result
                     try:
                         latest_number = float(latest["number"])
                     except (ValueError, TypeError):
@@ -107,12 +145,15 @@ class ManualCheck(commands.Cog):
                     if latest_number > last_notified:
                         updates.append((title, latest_number, latest["title"], latest["url"]))
                         # Update DB with resolved slug in case it changed
-                        await db.execute(
-                            "UPDATE chapter_tracking SET latest_chapter_notified = ?, manhwa_slug = ?, last_notified_time = CURRENT_TIMESTAMP WHERE user_id = ? AND manhwa_title = ?",
-                            (latest_number, resolved_slug, interaction.user.id, title)
-                        )
+                        pending_updates.append((latest_number, resolved_slug, interaction.user.id, title))
 
-                await db.commit()
+                if pending_updates:
+                    await db.execute("BEGIN")
+                    await db.executemany(
+                        UPDATE_FOLLOWED_SQL,
+                        pending_updates
+                    )
+                    await db.commit()
 
             if not updates:
                 await interaction.followup.send("✅ No new chapters since your last check.", ephemeral=True)
@@ -131,11 +172,10 @@ class ManualCheck(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
 
         except Exception as e:
-            print("[ManualCheck] Error during manual check:", e)
-            traceback.print_exc()
+            log.exception("Error during manual check: %s", e)
             await interaction.followup.send("⚠️ Failed to check updates. See logs.", ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(ManualCheck(bot))
-    print("[ManualCheck] Cog added")
+    log.info("Cog added")
     
@@ -2,29 +2,56 @@ from discord.ext import tasks, commands
 from discord import app_commands
 import discord
 import asyncio
+import logging
 import aiosqlite
-import aiohttp
-import traceback
+from aiolimiter import AsyncLimiter
 from typing import Optional
 
-class AddManhwaComick(commands.Cog):
+from cogs._db import configure_db
+from cogs._http import CachedFetchMixin
+
+log = logging.getLogger("manhwa.tracking")
+
+DM_TITLE = "📚 Your Manhwas Have New Chapters!"
+DM_FOOTER = "Powered by Comick"
+
+UPDATE_CHAPTER_SQL = "UPDATE chapter_tracking SET latest_chapter_notified = ?, last_notified_time = CURRENT_TIMESTAMP WHERE user_id = ? AND manhwa_slug = ?"
+INSERT_MANHWA_SQL = "INSERT OR IGNORE INTO manhwas (user_id, title, cover, link) VALUES (?, ?, ?, ?)"
+INSERT_TRACKING_SQL = "INSERT OR IGNORE INTO chapter_tracking (user_id, manhwa_title, manhwa_slug, latest_chapter_notified) VALUES (?, ?, ?, ?)"
+SELECT_TRACKED_SQL = "SELECT user_id, manhwa_title, manhwa_slug, latest_chapter_notified FROM chapter_tracking"
+UPDATE_COVER_SQL = "UPDATE manhwas SET cover = ? WHERE user_id = ? AND title = ? AND cover IS NULL"
+SELECT_COVERS_SQL = "SELECT ct.manhwa_slug, m.cover FROM chapter_tracking ct JOIN manhwas m ON m.user_id = ct.user_id AND m.title = ct.manhwa_title WHERE m.cover IS NOT NULL"
+
+class AddManhwaComick(CachedFetchMixin, commands.Cog):
     BASE_URL = "https://comick-api-proxy.notaspider.dev/api"
     WEB_BASE = "https://comick.dev"
-    TIMEOUT = aiohttp.ClientTimeout(total=10)
+    MAX_CONCURRENCY = 10
+    DM_CONCURRENCY = 5
+    DM_RATE = 5  # DMs per second
+    UPDATE_BATCH_SIZE = 64
+    CONSUMER_RESTART_DELAY = 5  # seconds
 
     def __init__(self, bot):
         self.bot = bot
         self._chapter_check_task = None
+        self._update_consumer_task = None
+        self._update_queue = asyncio.Queue(maxsize=256)
+        self._dm_limiter = AsyncLimiter(self.DM_RATE, 1)
         self.session = None
-        print("[AddManhwaComick] Cog initialized")
+        # slug -> cover URL, or None once the comic is known to have no cover
+        self._cover_cache: dict[str, Optional[str]] = {}
+        self._init_caches()
+        log.info("Cog initialized")
 
     async def cog_load(self):
         """runs when cog is loaded by discord.py; start tasks here."""
-        print("[AddManhwaComick] Cog loaded - initializing DB and starting task")
-        self.session = aiohttp.ClientSession(timeout=self.TIMEOUT)
+        log.info("Cog loaded - initializing DB and starting task")
+        self.session = self.bot.http_session
         await self.init_db()
         await self.init_chapter_tracking_db()
         # create and start the repeated task safely
+        if self._update_consumer_task is None:
+            self._start_update_consumer()
         if self._chapter_check_task is None:
             self._chapter_check_task = tasks.loop(hours=24)(self._chapter_check_loop)
             self._chapter_check_task.before_loop(self._before_chapter_check)
@@ -32,17 +59,57 @@ class AddManhwaComick(commands.Cog):
 
     async def cog_unload(self):
         """called when the cog is unloaded — stop background tasks cleanly."""
-        print("[AddManhwaComick] Unloading cog: stopping tasks")
+        log.info("Unloading cog: stopping tasks")
         if self._chapter_check_task and self._chapter_check_task.is_running():
             self._chapter_check_task.cancel()
-        if self.session:
-            await self.session.close()
+        if self._update_consumer_task:
+            self._update_consumer_task.cancel()
+            self._update_consumer_task = None
+
+    def _start_update_consumer(self):
+        task = asyncio.create_task(self._update_consumer())
+        task.add_done_callback(self._on_update_consumer_done)
+        self._update_consumer_task = task
+
+    def _on_update_consumer_done(self, task):
+        """Log a crashed consumer and restart it, so the producer never blocks on a full queue."""
+        if task.cancelled() or task is not self._update_consumer_task:
+            return
+        log.error(
+            "Update consumer stopped, restarting in %ss",
+            self.CONSUMER_RESTART_DELAY, exc_info=task.exception()
+        )
+        asyncio.get_running_loop().call_later(self.CONSUMER_RESTART_DELAY, self._restart_update_consumer, task)
+
+    def _restart_update_consumer(self, task):
+        # Skip if the cog was unloaded (or reloaded) while we waited
+        if task is self._update_consumer_task:
+            self._start_update_consumer()
 
     # ============ DATABASE ============
 
+    async def _flush_chapter_updates(self, db, pending_updates, pending_covers=()):
+        """Write queued (chapter, user_id, slug) and (cover, user_id, title) updates in one transaction."""
+        if not pending_updates and not pending_covers:
+            return
+        await db.execute("BEGIN")
+        try:
+            await db.executemany(
+                UPDATE_CHAPTER_SQL,
+                pending_updates
+            )
+            if pending_covers:
+                await db.executemany(UPDATE_COVER_SQL, pending_covers)
+            await db.commit()
+        except Exception:
+            # Don't leave the transaction open, or every later BEGIN fails
+            await db.rollback()
+            raise
+
     async def init_db(self):
         try:
             async with aiosqlite.connect('manhwa.db') as db:
+                await configure_db(db)
                 await db.execute('''
                     CREATE TABLE IF NOT EXISTS manhwas (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -52,15 +119,20 @@ class AddManhwaComick(commands.Cog):
                         link TEXT NOT NULL
                     )
                 ''')
+                # Drop duplicate adds left over from before the unique index existed
+                await db.execute(
+                    "DELETE FROM manhwas WHERE id NOT IN (SELECT MIN(id) FROM manhwas GROUP BY user_id, title)"
+                )
+                await db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_manhwas_user_title ON manhwas(user_id, title)")
                 await db.commit()
-            print("[AddManhwaComick] Manhwas table initialized")
+            log.info("Manhwas table initialized")
         except Exception as e:
-            print(f"[AddManhwaComick] Manhwas table init failed: {e}")
-            traceback.print_exc()
+            log.exception("Manhwas table init failed: %s", e)
 
     async def init_chapter_tracking_db(self):
         try:
             async with aiosqlite.connect('manhwa.db') as db:
+                await configure_db(db)
                 await db.execute('''
                     CREATE TABLE IF NOT EXISTS chapter_tracking (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -72,91 +144,131 @@ class AddManhwaComick(commands.Cog):
                         UNIQUE(user_id, manhwa_slug)
                     )
                 ''')
+                # user_id-only lookups are already served by the UNIQUE(user_id, manhwa_slug) index
+                await db.execute("CREATE INDEX IF NOT EXISTS idx_ct_user_title ON chapter_tracking(user_id, manhwa_title)")
                 await db.commit()
-            print("[AddManhwaComick] Chapter tracking table initialized")
+            log.info("Chapter tracking table initialized")
         except Exception as e:
-            print(f"[AddManhwaComick] Chapter tracking table init failed: {e}")
-            traceback.print_exc()
+            log.exception("Chapter tracking table init failed: %s", e)
 
     # ============ UTILITIES ============
 
-    async def fetch_json(self, url: str, params: Optional[dict] = None, retries: int = 2, timeout: int = 10):
-        """Fetch JSON from API with basic retries and timeout."""
-        if not self.session:
-            return None
-
-        for attempt in range(1, retries + 2):
-            try:
-                async with self.session.get(url, params=params) as resp:
-                    if resp.status != 200:
-                        print(f"[AddManhwaComick] API returned {resp.status} for {url} (attempt {attempt})")
-                        if attempt <= retries:
-                            await asyncio.sleep(1)
-                            continue
-                        return None
-                    return await resp.json()
-            except asyncio.TimeoutError:
-                print(f"[AddManhwaComick] API request timeout for {url} (attempt {attempt})")
-                if attempt <= retries:
-                    await asyncio.sleep(1)
-                    continue
-                return None
-            except Exception as e:
-                print(f"[AddManhwaComick] Fetch error for {url} (attempt {attempt}): {e}")
-                if attempt <= retries:
-                    await asyncio.sleep(1)
-                    continue
-                return None
-
     async def search_slug(self, title: str):
+        slug, top, _ = await self._search_slug(title)
+        return slug, top
+
+    async def _search_slug(self, title: str):
+        """Like search_slug, plus the HTTP status of the search."""
         search_url = f"{self.BASE_URL}/v1.0/search"
-        print(f"[AddManhwaComick] Searching for: {title}")
-        data = await self.fetch_json(search_url, params={"q": title, "tachiyomi": "true"})
+        log.debug("Searching for: %s", title)
+        status, data = await self.fetch_json_status(search_url, params={"q": title, "tachiyomi": "true"})
         if not data:
-            print(f"[AddManhwaComick] No results for: {title}")
-            return None, None
+            log.info("No results for: %s", title)
+            return None, None, status
         top = data[0]
         slug = top.get("slug")
-        print(f"[AddManhwaComick] Found: {top.get('title', title)} (slug: {slug})")
-        return slug, top
+        log.debug("Found: %s (slug: %s)", top.get('title', title), slug)
+        return slug, top, status
 
-    async def get_latest_chapter(self, title: str, slug: str):
+    async def get_latest_chapter(self, title: str, slug: str, refresh_cover: bool = False):
         """
         Returns the latest chapter info for a given manhwa title/slug.
-        Resolves slug if needed.
+        Successful lookups are cached per slug, misses per (slug, title).
+        Lookups that failed on a timeout or 5xx are not cached.
         """
-        # Step 1: Try current slug
-        comic_url = f"{self.BASE_URL}/v1.0/comic/{slug}"
-        comic_data = await self.fetch_json(comic_url, params={"tachiyomi": "true"})
-
+        hit, _ = self._cache_get((slug, title))
+        if hit:
+            return None
+        hit, cached = self._cache_get(slug)
+        if hit:
+            return dict(cached, title=title)
+
+        latest, failed = await self._fetch_latest_chapter(title, slug, refresh_cover)
+        if latest:
+            self._cache_put(slug, latest, self.POSITIVE_TTL)
+        elif not failed:
+            self._cache_put((slug, title), None, self.NEGATIVE_TTL)
+        return latest
+
+    async def _probe_chapter(self, slug: str):
+        """(latest chapter or None, HTTP status) from the cheap chapters endpoint."""
+        chapters_url = f"{self.BASE_URL}/v1.0/comic/{slug}/chapters"
+        status, data = await self.fetch_json_status(chapters_url, params={"limit": 1, "tachiyomi": "true"}, cache_key=slug)
+        if not data or "chapters" not in data or not data["chapters"]:
+            return None, status
+        return data["chapters"][0], status
+
+    async def _fetch_comic(self, slug: str):
+        """(comic metadata or None, HTTP status); refreshes the cached cover as a side effect."""
+        status, comic_data = await self.fetch_json_status(f"{self.BASE_URL}/v1.0/comic/{slug}", params={"tachiyomi": "true"})
         if not comic_data or "comic" not in comic_data:
-            # Fallback: search by title
-            new_slug, top = await self.search_slug(title)
-            if not new_slug:
-                print(f"[AddManhwaComick] Could not resolve slug for {title}")
-                return None
-            slug = new_slug
-            comic_data = await self.fetch_json(f"{self.BASE_URL}/v1.0/comic/{slug}", params={"tachiyomi": "true"})
-            if not comic_data or "comic" not in comic_data:
-                print(f"[AddManhwaComick] No comic data for {title} after resolving slug")
-                return None
-
+            return None, status
         comic_obj = comic_data["comic"]
-        hid = comic_obj.get("hid")
         cover_url = comic_obj.get("cover_url") or comic_obj.get("cover")
-
+        if cover_url or slug not in self._cover_cache:
+            self._cover_cache[slug] = cover_url
+        return comic_obj, status
+
+    async def _probe_hid_chapter(self, slug: str):
+        """(latest chapter or None, failed) via the comic's hid-keyed chapters endpoint."""
+        comic_obj, status = await self._fetch_comic(slug)
+        failed = not self._is_miss(status)
+        hid = comic_obj.get("hid") if comic_obj else None
         if not hid:
-            print(f"[AddManhwaComick] No hid found for {title}")
-            return None
+            log.debug("No hid found for %s", slug)
+            return None, failed
 
-        # Step 2: Fetch latest chapter by hid
         chapters_url = f"{self.BASE_URL}/v1.0/comic/{hid}/chapters"
-        chapters_data = await self.fetch_json(chapters_url, params={"limit": 1, "tachiyomi": "true"})
+        status, chapters_data = await self.fetch_json_status(chapters_url, params={"limit": 1, "tachiyomi": "true"})
+        failed = failed or not self._is_miss(status)
         if not chapters_data or "chapters" not in chapters_data or not chapters_data["chapters"]:
-            print(f"[AddManhwaComick] No chapters found for {title}")
-            return None
+            return None, failed
+        return chapters_data["chapters"][0], failed
+
+    async def _fetch_latest_chapter(self, title: str, slug: str, refresh_cover: bool = False):
+        """
+        Fetches the latest chapter info for a given manhwa title/slug.
+        Resolves slug if needed; comic metadata is only fetched when
+        refresh_cover is set or the chapters endpoint has nothing.
+
+        Returns (info or None, failed), where failed means some request
+        along the way got no usable answer (timeout, 5xx, ...).
+        """
+        original_slug = slug
+
+        # Step 1: Cheap probe - latest chapter straight from the slug
+        latest, status = await self._probe_chapter(slug)
+        failed = not self._is_miss(status)
 
-        latest = chapters_data["chapters"][0]
+        if not latest:
+            # Step 2: Fallback: search by title and probe again
+            new_slug, _, status = await self._search_slug(title)
+            failed = failed or not self._is_miss(status)
+            if not new_slug:
+                log.debug("Could not resolve slug for %s", title)
+            elif new_slug != slug:
+                slug = new_slug
+                latest, status = await self._probe_chapter(slug)
+                failed = failed or not self._is_miss(status)
+
+        if not latest:
+            # Step 3: Last resort - chapters keyed by hid, for the searched slug and then the tracked one
+            for candidate in dict.fromkeys((slug, original_slug)):
+                latest, hid_failed = await self._probe_hid_chapter(candidate)
+                failed = failed or hid_failed
+                if latest:
+                    slug = candidate
+                    break
+            else:
+                log.warning("No chapters found for %s", title)
+                return None, failed
+        elif refresh_cover:
+            await self._fetch_comic(slug)
+
+        if slug != original_slug and slug in self._cover_cache:
+            # Keep the tracked slug from asking for a cover refresh every cycle
+            self._cover_cache.setdefault(original_slug, self._cover_cache[slug])
+        cover_url = self._cover_cache.get(slug)
         chap_num_raw = latest.get("chap") or latest.get("chapter") or 0
         try:
             chap_num = float(chap_num_raw)
@@ -174,13 +286,13 @@ class AddManhwaComick(commands.Cog):
             "chapter_title": chap_title,
             "link": chap_link,
             "cover": cover_url
-        }
+        }, False
 
     # ============ SLASH COMMANDS ============
 
     @app_commands.command(name="add_manhwa", description="Add a manhwa to your list using Comick API")
     async def add_manhwa(self, interaction: discord.Interaction, title: str):
-        print(f"[AddManhwaComick] add_manhwa called by {interaction.user} with title: {title}")
+        log.info("add_manhwa called by %s with title: %s", interaction.user, title)
         await interaction.response.defer()
 
         slug, top = await self.search_slug(title)
@@ -193,22 +305,30 @@ class AddManhwaComick(commands.Cog):
 
         try:
             async with aiosqlite.connect('manhwa.db') as db:
-                await db.execute(
-                    "INSERT INTO manhwas (user_id, title, cover, link) VALUES (?, ?, ?, ?)",
+                await configure_db(db)
+                await db.execute("BEGIN")
+                cursor = await db.execute(
+                    INSERT_MANHWA_SQL,
                     (interaction.user.id, top.get("title", title), cover, url)
                 )
+                # OR IGNORE leaves rowcount at 0 when the title is already tracked
+                added = cursor.rowcount > 0
                 await db.execute(
-                    "INSERT OR IGNORE INTO chapter_tracking (user_id, manhwa_title, manhwa_slug, latest_chapter_notified) VALUES (?, ?, ?, ?)",
+                    INSERT_TRACKING_SQL,
                     (interaction.user.id, top.get("title", title), slug, 0)
                 )
                 await db.commit()
-            print(f"[AddManhwaComick] Inserted {top.get('title', title)} for user {interaction.user.id}")
+            if added:
+                log.info("Inserted %s for user %s", top.get('title', title), interaction.user.id)
         except Exception as e:
-            print(f"[AddManhwaComick] Database insert failed: {e}")
-            traceback.print_exc()
+            log.exception("Database insert failed: %s", e)
             await interaction.followup.send("❌ Failed to save to database. Try again.")
             return
 
+        if not added:
+            await interaction.followup.send(f"ℹ️ **{top.get('title', title)}** is already in your list.")
+            return
+
         embed = discord.Embed(
             title=top.get("title", title),
             url=url,
@@ -222,10 +342,11 @@ class AddManhwaComick(commands.Cog):
 
     @app_commands.command(name="remove_manhwa", description="Remove a manhwa from your list")
     async def remove_manhwa(self, interaction: discord.Interaction, title: str):
-        print(f"[AddManhwaComick] remove_manhwa called by {interaction.user} for: {title}")
+        log.info("remove_manhwa called by %s for: %s", interaction.user, title)
         await interaction.response.defer()
         try:
             async with aiosqlite.connect('manhwa.db') as db:
+                await configure_db(db)
                 async with db.execute("SELECT link FROM manhwas WHERE title = ? AND user_id = ?", (title, interaction.user.id)) as cursor:
                     row = await cursor.fetchone()
                 if not row:
@@ -252,81 +373,136 @@ class AddManhwaComick(commands.Cog):
             else:
                 await interaction.followup.send(f"🗑️ Removed **{title}** from your list!")
         except Exception as e:
-            print(f"[AddManhwaComick] Database delete failed: {e}")
-            traceback.print_exc()
+            log.exception("Database delete failed: %s", e)
             await interaction.followup.send("❌ Failed to remove. Try again.")
 
     # ============ BACKGROUND TASK ============
 
     async def _before_chapter_check(self):
         await self.bot.wait_until_ready()
-        print("[AddManhwaComick] Bot ready, chapter check task will start now")
+        log.info("Bot ready, chapter check task will start now")
 
-    async def _chapter_check_loop(self):
-        print("[AddManhwaComick] Running chapter check...")
-        async with aiosqlite.connect('manhwa.db') as db:
-            async with db.execute("SELECT user_id, manhwa_title, manhwa_slug, latest_chapter_notified FROM chapter_tracking") as cursor:
-                rows = await cursor.fetchall()
+    async def _notify(self, uid, updates, sem):
+        """DM one user their new chapters."""
+        async with sem:
             try:
-                user_updates = {}
+                user = self.bot.get_user(uid) or await self.bot.fetch_user(uid)
+                embed = discord.Embed(
+                    title=DM_TITLE,
+                    description=f"**{len(updates)}** new chapter(s) since last check:",
+                    color=0x2b2d31
+                )
+                if updates and updates[0]['cover']:
+                    embed.set_image(url=updates[0]['cover'])
+
+                for update in updates:
+                    chapter = update['chapter']
+                    chapter_num = int(chapter) if chapter.is_integer() else chapter
+                    parts = [f"**Chapter {chapter_num}**"]
+                    if update['chapter_title']:
+                        parts.append(f"_{update['chapter_title']}_")
+                    parts.append(f"[Read here]({update['link']})")
+                    embed.add_field(name=update['title'], value="\n".join(parts), inline=False)
+
+                embed.set_footer(text=DM_FOOTER)
+                # discord.py already waits out any 429 it receives
+                async with self._dm_limiter:
+                    await user.send(embed=embed)
+                log.debug("Sent %s updates to %s", len(updates), uid)
+            except Exception as e:
+                log.exception("Failed to send DM to %s: %s", uid, e)
+
+    async def _chapter_check_loop(self):
+        """Producer: look up every tracked series and queue the results."""
+        log.info("Running chapter check...")
+        try:
+            async with aiosqlite.connect('manhwa.db') as db:
+                await configure_db(db)
+                async with db.execute(SELECT_TRACKED_SQL) as cursor:
+                    rows = await cursor.fetchall()
+                # Covers saved by add_manhwa, so steady-state checks skip /comic/{slug}
+                async with db.execute(SELECT_COVERS_SQL) as cursor:
+                    for cover_slug, cover in await cursor.fetchall():
+                        self._cover_cache.setdefault(cover_slug, cover)
+
+            # Group subscribers by slug so each series is looked up once
+            by_slug = {}
+            for user_id, manhwa_title, manhwa_slug, latest_notified in rows:
+                by_slug.setdefault(manhwa_slug, []).append((user_id, manhwa_title, latest_notified))
+
+            log.info("Checking %s tracked manhwas across %s series", len(rows), len(by_slug))
+            sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+            async def check_one(manhwa_slug, subscribers):
+                try:
+                    needs_cover = manhwa_slug not in self._cover_cache
+                    async with sem:
+                        latest_info = await self.get_latest_chapter(
+                            subscribers[0][1], manhwa_slug, refresh_cover=needs_cover
+                        )
+                    if latest_info:
+                        await self._update_queue.put((manhwa_slug, latest_info, subscribers, needs_cover))
+                except Exception as e:
+                    log.exception("Error checking %s: %s", manhwa_slug, e)
+
+            await asyncio.gather(*[check_one(slug, subs) for slug, subs in by_slug.items()])
+        except Exception as e:
+            log.exception("Chapter check failed: %s", e)
 
-                print(f"[AddManhwaComick] Checking {len(rows)} tracked manhwas")
-                for user_id, manhwa_title, manhwa_slug, latest_notified in rows:
-                    try:
-                        latest_info = await self.get_latest_chapter(manhwa_title, manhwa_slug)
-                        if not latest_info:
-                            continue
+        # End-of-cycle marker so the consumer sends one DM per user
+        await self._update_queue.put(None)
 
+    async def _update_consumer(self):
+        """Consumer: batch DB writes for queued results, DM users once per cycle."""
+        async with aiosqlite.connect('manhwa.db') as db:
+            await configure_db(db)
+            user_updates = {}
+            pending_updates = []
+            pending_covers = []
+            while True:
+                item = await self._update_queue.get()
+                try:
+                    if item is not None:
+                        manhwa_slug, latest_info, subscribers, needs_cover = item
+                        if needs_cover and latest_info["cover"]:
+                            # Persist refreshed covers so restarts don't refetch them
+                            pending_covers.extend((latest_info["cover"], uid, title) for uid, title, _ in subscribers)
                         latest_chapter_num = latest_info["chapter"]
-                        if latest_chapter_num > (latest_notified or 0):
-                            if user_id not in user_updates:
-                                user_updates[user_id] = []
-                            user_updates[user_id].append(latest_info)
-
-                            # Update DB immediately
-                            await db.execute(
-                                "UPDATE chapter_tracking SET latest_chapter_notified = ?, last_notified_time = CURRENT_TIMESTAMP WHERE user_id = ? AND manhwa_slug = ?",
-                                (latest_chapter_num, user_id, manhwa_slug)
-                                )
-                            await db.commit()
-                    except Exception as e:
-                        print(f"[AddManhwaComick] Error checking {manhwa_title}: {e}")
-                        traceback.print_exc()
-
-                # Send DMs
-                print(f"[AddManhwaComick] Sending updates to {len(user_updates)} users")
-                for uid, updates in user_updates.items():
-                    try:
-                        user = await self.bot.fetch_user(uid)
-                        embed = discord.Embed(
-                            title="📚 Your Manhwas Have New Chapters!",
-                            description=f"**{len(updates)}** new chapter(s) since last check:",
-                            color=0x2b2d31
+                        for user_id, manhwa_title, latest_notified in subscribers:
+                            if latest_chapter_num > (latest_notified or 0):
+                                user_updates.setdefault(user_id, []).append(dict(latest_info, title=manhwa_title))
+                                pending_updates.append((latest_chapter_num, user_id, manhwa_slug))
+
+                    # Flush on a full batch or at the end-of-cycle marker
+                    pending = len(pending_updates) + len(pending_covers)
+                    if pending and (item is None or pending >= self.UPDATE_BATCH_SIZE):
+                        await self._flush_chapter_updates(db, pending_updates, pending_covers)
+                        pending_updates, pending_covers = [], []
+                except Exception as e:
+                    # Rows stay pending and are retried at the next flush this cycle
+                    log.exception("Update batch failed: %s", e)
+
+                try:
+                    if item is None:
+                        # Send DMs even when the flush failed
+                        log.info("Sending updates to %s users", len(user_updates))
+                        dm_sem = asyncio.Semaphore(self.DM_CONCURRENCY)
+                        await asyncio.gather(
+                            *[self._notify(uid, updates, dm_sem) for uid, updates in user_updates.items()],
+                            return_exceptions=True
                         )
-                        if updates and updates[0]['cover']:
-                            embed.set_image(url=updates[0]['cover'])
-
-                        for update in updates:
-                            chapter_num = int(update['chapter']) if update['chapter'] == int(update['chapter']) else update['chapter']
-                            chapter_info = f"**Chapter {chapter_num}**"
-                            if update['chapter_title']:
-                                chapter_info += f"\n_{update['chapter_title']}_"
-                            chapter_info += f"\n[Read here]({update['link']})"
-                            embed.add_field(name=update['title'], value=chapter_info, inline=False)
-
-                        embed.set_footer(text="Powered by Comick")
-                        await user.send(embed=embed)
-                        await asyncio.sleep(1)
-                        print(f"[AddManhwaComick] Sent {len(updates)} updates to {uid}")
-                    except Exception as e:
-                        print(f"[AddManhwaComick] Failed to send DM to {uid}: {e}")
-                        traceback.print_exc()
-            except Exception as e:
-                print(f"[AddManhwaComick] Chapter check failed: {e}")
-                traceback.print_exc()
+                except Exception as e:
+                    log.exception("Sending updates failed: %s", e)
+                finally:
+                    if item is None:
+                        if pending_updates or pending_covers:
+                            log.error("Dropping %s unsaved updates", len(pending_updates) + len(pending_covers))
+                        # Start the next cycle clean so nothing is sent twice
+                        user_updates, pending_updates, pending_covers = {}, [], []
+                    self._update_queue.task_done()
 
 # setup function for load_extension
 async def setup(bot):
     cog = AddManhwaComick(bot)
     await bot.add_cog(cog)
-    print("[AddManhwaComick] Cog added")
\ No newline at end of file
+    log.info("Cog added")
\ No newline at end of file
@@ -0,0 +1,10 @@
+# cogs/_db.py
+
+
+async def configure_db(db):
+    """Apply per-connection PRAGMAs."""
+    await db.execute("PRAGMA journal_mode=WAL")
+    await db.execute("PRAGMA synchronous=NORMAL")
+    await db.execute("PRAGMA busy_timeout=5000")
+    await db.execute("PRAGMA temp_store=MEMORY")
+    await db.execute("PRAGMA cache_size=-20000")
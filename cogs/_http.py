@@ -0,0 +1,160 @@
+# cogs/_http.py
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import orjson
+
+log = logging.getLogger("manhwa.http")
+
+
+class CachedFetchMixin:
+    """GET JSON helpers shared by the Comick cogs.
+
+    Cogs using this call _init_caches() in __init__ and set self.session.
+    """
+    SLUG_CACHE_MAX = 1024
+    POSITIVE_TTL = 600
+    NEGATIVE_TTL = 3600
+    HTTP_CACHE_MAX = 512
+    HTTP_CACHE_TTL = 120
+    ETAG_CACHE_MAX = 1024
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    # Statuses that prove a lookup came back empty, as opposed to failing
+    MISS_STATUSES = {200, 404}
+    FETCH_RETRIES = 2
+    RETRY_AFTER_MAX = 30  # seconds; longer waits give up instead of holding a slot
+
+    def _init_caches(self):
+        self._slug_cache: OrderedDict[object, tuple[float, Optional[dict]]] = OrderedDict()
+        self._http_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._etag_cache: OrderedDict[str, tuple[Optional[str], Optional[str], dict]] = OrderedDict()
+
+    # ---------------- Lookup cache ----------------
+    def _cache_get(self, key):
+        """Return (hit, value) for a cached lookup, dropping it once expired."""
+        entry = self._slug_cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._slug_cache[key]
+            return False, None
+        self._slug_cache.move_to_end(key)
+        return True, value
+
+    def _cache_put(self, key, value, ttl):
+        self._slug_cache[key] = (time.monotonic() + ttl, value)
+        self._slug_cache.move_to_end(key)
+        if len(self._slug_cache) > self.SLUG_CACHE_MAX:
+            self._slug_cache.popitem(last=False)
+
+    # ---------------- HTTP cache ----------------
+    def _remember_validators(self, cache_key, resp, data):
+        """Keep ETag/Last-Modified and the body so a later 304 can reuse it."""
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._etag_cache[cache_key] = (etag, last_modified, data)
+            self._etag_cache.move_to_end(cache_key)
+            if len(self._etag_cache) > self.ETAG_CACHE_MAX:
+                self._etag_cache.popitem(last=False)
+
+    def _conditional_headers(self, cache_key):
+        validators = self._etag_cache.get(cache_key) if cache_key else None
+        if not validators:
+            return None, {}
+        self._etag_cache.move_to_end(cache_key)
+        etag, last_modified, _ = validators
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return validators, headers
+
+    def _store_response(self, key, data):
+        self._http_cache[key] = (time.monotonic() + self.HTTP_CACHE_TTL, data)
+        self._http_cache.move_to_end(key)
+        if len(self._http_cache) > self.HTTP_CACHE_MAX:
+            self._http_cache.popitem(last=False)
+        return data
+
+    # ---------------- Retries ----------------
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with up to 25% jitter, capped at 8s."""
+        return min(8, 0.25 * 2 ** (attempt - 1)) * (1 + random.random() * 0.25)
+
+    def _retry_after(self, resp, default: float) -> float:
+        try:
+            return max(0.0, float(resp.headers.get("Retry-After", default)))
+        except ValueError:
+            return default
+
+    # ---------------- Fetch ----------------
+    def _is_miss(self, status: Optional[int]) -> bool:
+        """True when an empty result can be negatively cached."""
+        return status in self.MISS_STATUSES
+
+    async def fetch_json(self, url: str, params: Optional[dict] = None, cache_key: Optional[str] = None,
+                         retries: Optional[int] = None):
+        """Fetch JSON from API, returning None on any failure."""
+        _, data = await self.fetch_json_status(url, params=params, cache_key=cache_key, retries=retries)
+        return data
+
+    async def fetch_json_status(self, url: str, params: Optional[dict] = None, cache_key: Optional[str] = None,
+                                retries: Optional[int] = None):
+        """Fetch JSON from API, retrying 429/5xx with exponential backoff.
+
+        Returns (status, data). status is the last HTTP status seen (200 for
+        cache hits and 304s) or None when the request never got a response.
+        Successful responses are memoized for HTTP_CACHE_TTL seconds.
+        When cache_key is given, the request is sent conditionally and a 304
+        returns the body last seen for that key.
+        """
+        if not self.session:
+            return None, None
+        if retries is None:
+            retries = self.FETCH_RETRIES
+
+        key = (url, tuple(sorted((params or {}).items())))
+        entry = self._http_cache.get(key)
+        if entry and entry[0] >= time.monotonic():
+            self._http_cache.move_to_end(key)
+            return 200, entry[1]
+
+        validators, headers = self._conditional_headers(cache_key)
+
+        for attempt in range(1, retries + 2):
+            delay = self._backoff_delay(attempt)
+            status = None
+            try:
+                async with self.session.get(url, params=params, headers=headers) as resp:
+                    if resp.status == 304 and validators:
+                        return 200, self._store_response(key, validators[2])
+                    if resp.status == 200:
+                        data = await resp.json(loads=orjson.loads)
+                        if cache_key:
+                            self._remember_validators(cache_key, resp, data)
+                        return 200, self._store_response(key, data)
+
+                    status = resp.status
+                    log.warning("API returned %s for %s (attempt %s)", status, url, attempt)
+                    if status not in self.RETRYABLE_STATUSES:
+                        return status, None
+                    if status == 429:
+                        delay = self._retry_after(resp, delay)
+                        if delay > self.RETRY_AFTER_MAX:
+                            log.warning("Retry-After %.0fs for %s exceeds cap, giving up", delay, url)
+                            return status, None
+            except asyncio.TimeoutError:
+                log.warning("API request timeout for %s (attempt %s)", url, attempt)
+            except Exception as e:
+                log.warning("Fetch error for %s (attempt %s): %s", url, attempt, e)
+
+            if attempt > retries:
+                return status, None
+            await asyncio.sleep(delay)
@@ -3,6 +3,10 @@ from discord.ext import commands
 import os
 from dotenv import load_dotenv
 import asyncio
+import aiohttp
+import logging
+import logging.handlers
+import queue
 import traceback
 
 # ------------------------
@@ -18,6 +22,22 @@ intents.message_content = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 
+# ------------------------
+# Logging
+# ------------------------
+def setup_logging():
+    """Route all logging through a queue so the event loop never blocks on stdout."""
+    log_queue = queue.Queue(-1)
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream)
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    return listener
+
 # ------------------------
 # Cogs
 # ------------------------
@@ -69,8 +89,27 @@ async def on_ready():
 # ------------------------
 async def main():
     async with bot:
-        await load_cogs()
-        await bot.start(TOKEN)
+        # Shared by every cog; created here so it binds to the running loop
+        bot.http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={"User-Agent": "Tachiyomi/1.0"},
+            connector=aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=20,
+                ttl_dns_cache=600,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+        )
+        try:
+            await load_cogs()
+            await bot.start(TOKEN)
+        finally:
+            await bot.http_session.close()
 
-if __name__ == "__main__":  
-    asyncio.run(main())         
\ No newline at end of file
+if __name__ == "__main__":
+    listener = setup_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()